@@ -87,7 +87,7 @@ You have access to:
 - File system tools (read_file, list_dir)
 - Web access tools (web_search, get_website_content)
 - Code execution capabilities (execute_python_code)
-- Research tools (get_arxiv_paper, summarize_research_paper)
+- Research tools (get_arxiv_paper, get_arxiv_papers, summarize_research_paper)
 - YouTube transcripts (get_youtube_transcript)
 - System information tools (get_system_info, run_shell_command)
 
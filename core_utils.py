@@ -7,7 +7,14 @@ import colorama
 from colorama import Fore, Style
 from rich.console import Console
 from rich.theme import Theme
+import re
+import codecs
 import time
+import atexit
+import threading
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
 
 # Initialize colorama
 colorama.init(autoreset=True)
@@ -52,3 +59,140 @@ def tool_report_print(msg: str, value: str = None, is_error: bool = False, execu
         message += f" ({execution_time:.2f}s)"
     
     print(message)
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key.
+    
+    Lowercases the scheme and host, drops the fragment and sorts the query
+    parameters so equivalent spellings of a URL share one entry.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live.
+    
+    Used by tools to avoid repeating network work for identical calls
+    within a session.
+    """
+    
+    def __init__(self, maxsize: int = 256, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key, or default if it's missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+# Fail fast when a host is unreachable; the per-call read timeouts bound the rest.
+# build_session() does not retry connect or read errors, so these are real limits.
+CONNECT_TIMEOUT = 5
+
+# Page bodies are truncated past this size so parse time and memory stay bounded
+MAX_PAGE_BYTES = 4 * 1024 * 1024
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+def build_session(user_agent: Optional[str] = None, pool_connections: int = 32, pool_maxsize: int = 64):
+    """
+    Create a requests session with a keep-alive pool and retries, closed at exit.
+    
+    Transient failures of GET and HEAD requests are retried with backoff; the
+    last response is returned as-is so raise_for_status still reports it.
+    Only error statuses are retried. Connection failures and timeouts are
+    raised straight away, as requests' ConnectionError/ConnectTimeout and
+    ReadTimeout, so a call's (connect, read) timeout bounds each wait instead
+    of being multiplied by the retries. Retry-After is ignored, since urllib3
+    would sleep for it uncapped and outside the request timeouts.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+        connect=False,
+        read=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    
+    session = requests.Session()
+    if user_agent:
+        session.headers['User-Agent'] = user_agent
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    atexit.register(session.close)
+    return session
+
+def declared_charset(response) -> Optional[str]:
+    """
+    Charset from the Content-Type header, or None to let the parser sniff <meta charset>.
+    
+    Parsers are handed raw bytes so requests never runs its charset detection over the body.
+    Charsets Python does not know (e.g. "utf8mb4") are treated as undeclared.
+    """
+    match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+    if not match:
+        return None
+    try:
+        codecs.lookup(match.group(1))
+    except LookupError:
+        return None
+    return match.group(1)
+
+def read_capped(response, limit: Optional[int] = None) -> bytes:
+    """
+    Read a streamed response body, stopping once it exceeds ``limit`` bytes.
+    
+    ``limit`` defaults to MAX_PAGE_BYTES. The response is closed afterwards.
+    """
+    if limit is None:
+        limit = MAX_PAGE_BYTES
+    body = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=65536):
+            body.extend(chunk)
+            if len(body) > limit:
+                break
+    finally:
+        response.close()
+    return bytes(body)
@@ -84,10 +84,8 @@ def _display_registration_report(console: Console, discovery_result: Dict[str, A
     
     console.print()
 
-async def _run_interaction_loop(session: PromptSession, assistant: Assistant) -> None:
+async def _run_interaction_loop(session: PromptSession, assistant: Assistant, console: Console) -> None:
     """Run the main interaction loop."""
-    console = Console()
-
     while True:
         try:
             # Get user input with proper styling on a new line
@@ -185,7 +183,7 @@ async def main():
     )
 
     # Main interaction loop
-    await _run_interaction_loop(session, assistant)
+    await _run_interaction_loop(session, assistant, console)
 
 if __name__ == "__main__":
     import asyncio
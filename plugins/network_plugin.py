@@ -2,26 +2,317 @@
 Network plugin providing web and internet operations.
 """
 import os
+import sys
+import html
+import shutil
+import subprocess
 import requests
 import random
+import itertools
+import functools
 import urllib.parse
 import time
 import re
-from typing import Dict, Any, List, Optional
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
 from plugins import Plugin, tool, capability
-from core_utils import tool_message_print, tool_report_print
+from core_utils import (
+    tool_message_print, tool_report_print, normalize_url, TTLCache,
+    build_session, declared_charset, CONNECT_TIMEOUT, MAX_PAGE_BYTES
+)
+
+# Common user agents to rotate for avoiding bot detection
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
+]
+
+# Round-robin over a shuffled copy, so consecutive agents always differ
+_USER_AGENT_CYCLE = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)))
+
+# Shared session; one user agent per session keeps keep-alive connections reusable.
+# Accept-Encoding comes from urllib3, which advertises br when brotli is installed;
+# forcing br without the decoder would leave compressed bytes in response.content.
+_SESSION = build_session(user_agent=next(_USER_AGENT_CYCLE))
+
+def rotate_user_agent() -> str:
+    """Switch the shared session to a different user agent and return it."""
+    user_agent = next(_USER_AGENT_CYCLE)
+    _SESSION.headers['User-Agent'] = user_agent
+    return user_agent
+
+# Cache of extracted page text: url -> (etag, last_modified, fetched_at, text).
+# Entries younger than the TTL are served without any request; older ones are
+# revalidated with a conditional GET when the server sent validators.
+_URL_CACHE: "OrderedDict[str, Tuple[Optional[str], Optional[str], float, str]]" = OrderedDict()
+_URL_CACHE_MAX_SIZE = 256
+_URL_CACHE_TTL = 600
+_URL_CACHE_LOCK = threading.Lock()
+
+def _conditional_headers(url: str) -> Dict[str, str]:
+    """Build If-None-Match / If-Modified-Since headers from a cached response."""
+    with _URL_CACHE_LOCK:
+        entry = _URL_CACHE.get(url)
+    if entry is None:
+        return {}
+    
+    etag, last_modified, _, _ = entry
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return headers
+
+def _cache_get(url: str, max_age: Optional[float] = None) -> Optional[str]:
+    """
+    Return the cached text for a URL and mark it as recently used.
+    
+    With ``max_age``, entries fetched or revalidated longer ago than that are ignored.
+    """
+    with _URL_CACHE_LOCK:
+        entry = _URL_CACHE.get(url)
+        if entry is None:
+            return None
+        if max_age is not None and time.monotonic() - entry[2] > max_age:
+            return None
+        _URL_CACHE.move_to_end(url)
+        return entry[3]
+
+def _cache_revalidated(url: str) -> None:
+    """Restart the TTL of an entry the server confirmed as unchanged."""
+    with _URL_CACHE_LOCK:
+        entry = _URL_CACHE.get(url)
+        if entry is not None:
+            _URL_CACHE[url] = (entry[0], entry[1], time.monotonic(), entry[3])
+
+def _cache_put(url: str, response_headers: Dict[str, str], text: str) -> None:
+    """Store extracted text along with the response validators."""
+    etag = response_headers.get('ETag')
+    last_modified = response_headers.get('Last-Modified')
+    
+    with _URL_CACHE_LOCK:
+        _URL_CACHE[url] = (etag, last_modified, time.monotonic(), text)
+        _URL_CACHE.move_to_end(url)
+        while len(_URL_CACHE) > _URL_CACHE_MAX_SIZE:
+            _URL_CACHE.popitem(last=False)
+
+# Response headers of recent HEAD requests, used to resolve download filenames
+_HEAD_CACHE = TTLCache(maxsize=256, ttl=300)
+
+def _head_headers(url: str) -> Dict[str, str]:
+    """
+    Return the headers of a HEAD request for a URL, reusing recent responses.
+    
+    Only successful responses are cached, so failures are retried on the next call.
+    """
+    cache_key = normalize_url(url)
+    headers = _HEAD_CACHE.get(cache_key)
+    if headers is None:
+        response = _SESSION.head(url, allow_redirects=True, timeout=(CONNECT_TIMEOUT, 10))
+        headers = response.headers
+        if response.ok:
+            _HEAD_CACHE.set(cache_key, headers)
+            # Redirect targets are often requested directly afterwards
+            if response.url and response.url != url:
+                _HEAD_CACHE.set(normalize_url(response.url), headers)
+    return headers
+
+# Formatted transcripts by (video_id, languages); published transcripts rarely change
+_TRANSCRIPT_CACHE = TTLCache(maxsize=64, ttl=3600)
+
+# Desktop opener commands, launched detached instead of going through webbrowser
+_URL_OPENERS = {'linux': 'xdg-open', 'darwin': 'open'}
+
+def _spawn_url_opener(url: str) -> bool:
+    """Hand a URL to the platform opener in its own session; False if there is none."""
+    # Like webbrowser, only use xdg-open in a graphical session; headless it has nothing to open
+    if sys.platform == 'linux' and not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        return False
+    command = _URL_OPENERS.get(sys.platform)
+    opener = shutil.which(command) if command else None
+    if opener is None:
+        return False
+    subprocess.Popen(
+        [opener, url],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    return True
+
+def _is_gui_browser(browser) -> bool:
+    """True for webbrowser controllers that launch a separate window rather than use the terminal."""
+    import webbrowser
+    
+    if isinstance(browser, webbrowser.BackgroundBrowser):
+        return True
+    return isinstance(browser, webbrowser.UnixBrowser) and browser.background
+
+# Elements whose text is never part of the readable page content
+_NON_CONTENT_TAGS = ('script', 'style', 'header', 'footer', 'nav')
+_PAGE_TEXT_TAGS = ['title', 'body']
+
+def _clean_text(text: str) -> str:
+    """Strip every line and drop the empty ones."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return '\n'.join(lines)
+
+def _response_text(response: requests.Response) -> str:
+    """
+    Decode a text response body with its declared charset, defaulting to UTF-8.
+    
+    Unlike ``response.text`` this never falls back to requests' charset detection,
+    which scans the whole body in pure Python when no charset is declared.
+    """
+    return response.content.decode(declared_charset(response) or 'utf-8', errors='replace')
+
+def _stream_page_text(response: requests.Response, body: bytearray, chunk_size: int = 32768) -> Optional[str]:
+    """
+    Feed a streamed response into lxml's HTML parser as chunks arrive.
+    
+    Every chunk is also appended to ``body`` so callers can re-parse the page.
+    Reading stops after ``MAX_PAGE_BYTES``; the parser recovers the truncated tail.
+    Returns None when lxml could not build a document tree.
+    """
+    from lxml import etree
+    
+    parser = etree.HTMLParser(encoding=declared_charset(response))
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        body.extend(chunk)
+        parser.feed(chunk)
+        if len(body) > MAX_PAGE_BYTES:
+            response.close()
+            break
+    
+    try:
+        root = parser.close()
+    except etree.XMLSyntaxError:
+        return None
+    if root is None:
+        return None
+    
+    etree.strip_elements(root, etree.Comment, *_NON_CONTENT_TAGS, with_tail=False)
+    
+    parts = []
+    for section in (root.find('head/title'), root.find('body')):
+        if section is not None:
+            parts.extend(section.itertext())
+    return _clean_text('\n'.join(parts))
+
+def _soup_page_text(markup: bytes, encoding: Optional[str] = None) -> str:
+    """Extract readable text with BeautifulSoup, skipping everything in <head> but the title."""
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    # html.parser rather than lxml: this path only runs when lxml gave up on the markup
+    soup = BeautifulSoup(markup, 'html.parser', parse_only=SoupStrainer(_PAGE_TEXT_TAGS), from_encoding=encoding)
+    
+    for element in soup(list(_NON_CONTENT_TAGS)):
+        element.decompose()
+    
+    return _clean_text(soup.get_text(separator='\n'))
+
+# Video URL forms: watch?v=ID, youtu.be/ID, and embed/shorts/live paths
+_YT_URL_RES = [
+    re.compile(r'youtube\.com/watch\?(?:[^#]*&)?v=([A-Za-z0-9_-]{11})'),
+    re.compile(r'youtu\.be/([A-Za-z0-9_-]{11})'),
+    re.compile(r'youtube\.com/(?:embed|shorts|live)/([A-Za-z0-9_-]{11})'),
+]
+
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+_TITLE_SCAN_LIMIT = 65536
+_YT_OEMBED_URL = 'https://www.youtube.com/oembed'
+
+# Content-Disposition filename forms: RFC 5987 filename*=UTF-8''... and plain filename=...
+_CD_UTF8_RE = re.compile(r"filename\*=UTF-8''([\w\-%.]+)", re.IGNORECASE)
+_CD_FILENAME_RE = re.compile(r'filename=[\'"]?([^\'"\s;]+)[\'"]?')
+
+# Extensions for downloads whose name has to be derived from the Content-Type
+_CONTENT_TYPE_EXTENSIONS = {
+    'text/plain': '.txt',
+    'text/html': '.html',
+    'text/css': '.css',
+    'text/javascript': '.js',
+    'application/pdf': '.pdf',
+    'application/json': '.json',
+    'application/xml': '.xml',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'application/zip': '.zip'
+}
+
+def _safe_filename(name: str) -> Optional[str]:
+    """
+    Reduce a server-supplied name to a bare filename, or None if nothing usable is left.
+    
+    Decoded names can contain path separators, so "../" segments and absolute
+    paths must not reach os.path.join.
+    """
+    name = os.path.basename(name.replace('\\', '/')).strip()
+    if name in ('', '.', '..'):
+        return None
+    return name
+
+@functools.lru_cache(maxsize=1024)
+def _extract_youtube_video_id(video_url: str) -> Optional[str]:
+    """
+    Extract the video ID from a YouTube URL.
+    
+    Input that is not a YouTube URL is assumed to already be a video ID.
+    Returns None for YouTube URLs that don't contain a recognisable ID.
+    """
+    if 'youtube.com' not in video_url and 'youtu.be' not in video_url:
+        return video_url.strip()
+    
+    for pattern in _YT_URL_RES:
+        match = pattern.search(video_url)
+        if match:
+            return match.group(1)
+    return None
+
+def _fetch_youtube_title(video_id: str) -> Optional[str]:
+    """
+    Fetch a video's title, or None if it can't be read.
+    
+    The oEmbed endpoint answers with a few hundred bytes of JSON. Videos that
+    don't allow embedding are rejected there, so their title is scanned from
+    the first 64KB of the ~1MB watch page instead of parsing the HTML.
+    """
+    watch_url = f"https://www.youtube.com/watch?v={video_id}"
+    try:
+        response = _SESSION.get(_YT_OEMBED_URL, params={'url': watch_url, 'format': 'json'}, timeout=(CONNECT_TIMEOUT, 10))
+        if response.ok:
+            title = response.json().get('title')
+            if title:
+                return title
+        
+        head = bytearray()
+        with _SESSION.get(watch_url, timeout=(CONNECT_TIMEOUT, 10), stream=True) as response:
+            for chunk in response.iter_content(chunk_size=16384):
+                head.extend(chunk)
+                if b'</title>' in head or len(head) >= _TITLE_SCAN_LIMIT:
+                    break
+        
+        match = _TITLE_RE.search(head)
+        if not match:
+            return None
+        title = html.unescape(match.group(1).decode('utf-8', 'replace')).strip()
+        return title.replace(' - YouTube', '')
+    except Exception:
+        return None
 
 class NetworkPlugin(Plugin):
     """Plugin providing network operations."""
     
     # Common user agents to rotate for avoiding bot detection
-    USER_AGENTS = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:124.0) Gecko/20100101 Firefox/124.0",
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36",
-    ]
+    USER_AGENTS = USER_AGENTS
     
     @staticmethod
     @tool(
@@ -47,27 +338,39 @@ class NetworkPlugin(Plugin):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            # Use a random user agent
-            headers = {'User-Agent': random.choice(NetworkPlugin.USER_AGENTS)}
+            # Serve recently fetched pages straight from the cache
+            cache_key = normalize_url(url)
+            cached_text = _cache_get(cache_key, max_age=_URL_CACHE_TTL)
+            if cached_text is not None:
+                return cached_text
             
-            # Make the request
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Use BeautifulSoup for parsing
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Revalidate any older cached copy of the page
+            headers = _conditional_headers(cache_key)
             
-            # Remove script and style elements
-            for script_or_style in soup(['script', 'style', 'header', 'footer', 'nav']):
-                script_or_style.decompose()
+            # Make the request
+            response = _SESSION.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, 15), stream=True)
+            
+            # Page unchanged since the last fetch: reuse the parsed text
+            if response.status_code == 304:
+                response.close()
+                cached_text = _cache_get(cache_key)
+                if cached_text is not None:
+                    _cache_revalidated(cache_key)
+                    return cached_text
+                # Cache entry was evicted in the meantime, fetch unconditionally
+                response = _SESSION.get(url, timeout=(CONNECT_TIMEOUT, 15), stream=True)
+            
+            # Streamed responses hold a pooled connection until closed, even on errors
+            with response:
+                response.raise_for_status()
                 
-            # Extract text
-            text = soup.get_text(separator='\n')
+                # Parse while the body downloads; fall back to BeautifulSoup if lxml can't recover a tree
+                body = bytearray()
+                text = _stream_page_text(response, body)
+                if text is None:
+                    text = _soup_page_text(bytes(body), declared_charset(response))
             
-            # Clean up text: remove excessive newlines
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            text = '\n'.join(lines)
+            _cache_put(cache_key, response.headers, text)
             
             return text
             
@@ -103,12 +406,8 @@ class NetworkPlugin(Plugin):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            # Use default headers if none provided
-            if not headers:
-                headers = {'User-Agent': random.choice(NetworkPlugin.USER_AGENTS)}
-                
-            # Make the request
-            response = requests.get(url, params=params, headers=headers, timeout=15)
+            # Make the request; the session supplies a user agent unless one is given
+            response = _SESSION.get(url, params=params, headers=headers, timeout=(CONNECT_TIMEOUT, 15))
             
             # Build the result
             result = {
@@ -121,7 +420,7 @@ class NetworkPlugin(Plugin):
             # Add text content if it's text
             content_type = response.headers.get('Content-Type', '').lower()
             if 'text' in content_type or 'json' in content_type or 'xml' in content_type:
-                result["text"] = response.text
+                result["text"] = _response_text(response)
                 
                 # Parse JSON if applicable
                 if 'json' in content_type:
@@ -163,21 +462,23 @@ class NetworkPlugin(Plugin):
             from youtube_transcript_api import YouTubeTranscriptApi
             
             # Extract video ID from URL if needed
-            if 'youtube.com' in video_url or 'youtu.be' in video_url:
-                if 'youtube.com/watch' in video_url:
-                    query = urllib.parse.urlparse(video_url).query
-                    params = urllib.parse.parse_qs(query)
-                    video_id = params.get('v', [''])[0]
-                elif 'youtu.be/' in video_url:
-                    video_id = video_url.split('youtu.be/')[1].split('?')[0]
-                else:
-                    return "Error: Could not extract video ID from URL"
-            else:
-                # Assume the input is already a video ID
-                video_id = video_url
+            video_id = _extract_youtube_video_id(video_url)
+            if video_id is None:
+                return "Error: Could not extract video ID from URL"
                 
             if not video_id:
                 return "Error: No video ID found"
+            
+            cache_key = (video_id, tuple(languages))
+            cached = _TRANSCRIPT_CACHE.get(cache_key)
+            if cached is not None:
+                tool_report_print(f"Using cached transcript for {video_id}")
+                return cached
+                
+            # Look up the title in the background while the transcript is fetched
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+            title_future = executor.submit(_fetch_youtube_title, video_id)
+            executor.shutdown(wait=False)
                 
             # Try to get transcript in the specified languages
             try:
@@ -230,19 +531,13 @@ class NetworkPlugin(Plugin):
                         # Skip problematic entries
                         continue
                 
-                # Add video title if we can get it
-                try:
-                    import requests
-                    from bs4 import BeautifulSoup
-                    response = requests.get(f"https://www.youtube.com/watch?v={video_id}")
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    title = soup.find('title').text.replace(' - YouTube', '')
-                    header = f"Video: {title}\n\n"
-                except:
-                    header = ""
+                # Add video title if we could get it
+                title = title_future.result()
+                header = f"Video: {title}\n\n" if title else ""
                 
                 # Join transcript parts
                 result = header + "\n".join(formatted_transcript)
+                _TRANSCRIPT_CACHE.set(cache_key, result)
                 
                 tool_report_print(f"Successfully retrieved transcript with {len(formatted_transcript)} segments")
                 return result
@@ -286,12 +581,8 @@ class NetworkPlugin(Plugin):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            # Use default headers if none provided
-            if not headers:
-                headers = {'User-Agent': random.choice(NetworkPlugin.USER_AGENTS)}
-                
-            # Make the request
-            response = requests.post(url, data=data, json=json_data, headers=headers, timeout=15)
+            # Make the request; the session supplies a user agent unless one is given
+            response = _SESSION.post(url, data=data, json=json_data, headers=headers, timeout=(CONNECT_TIMEOUT, 15))
             
             # Build the result
             result = {
@@ -304,7 +595,7 @@ class NetworkPlugin(Plugin):
             # Add text content if it's text
             content_type = response.headers.get('Content-Type', '').lower()
             if 'text' in content_type or 'json' in content_type or 'xml' in content_type:
-                result["text"] = response.text
+                result["text"] = _response_text(response)
                 
                 # Parse JSON if applicable
                 if 'json' in content_type:
@@ -344,20 +635,38 @@ class NetworkPlugin(Plugin):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            # Open the URL in the default browser
-            success = webbrowser.open(url)
-            
-            if success:
+            # The opener returns immediately and outlives the assistant process
+            if _spawn_url_opener(url):
                 return {
                     "success": True,
                     "url": url,
                     "message": f"URL opened in default browser: {url}"
                 }
-            else:
+            
+            # Resolve the browser up front so a missing one is still reported
+            try:
+                browser = webbrowser.get()
+            except webbrowser.Error:
+                return {
+                    "success": False,
+                    "error": "Failed to open URL in browser"
+                }
+            
+            # A GUI browser can block while it starts up, so don't wait for it. Console
+            # browsers (w3m, lynx) take over the terminal and must run in the foreground.
+            if _is_gui_browser(browser):
+                threading.Thread(target=browser.open, args=(url,), daemon=True).start()
+            elif not browser.open(url):
                 return {
                     "success": False,
                     "error": "Failed to open URL in browser"
                 }
+            
+            return {
+                "success": True,
+                "url": url,
+                "message": f"URL opened in default browser: {url}"
+            }
                 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -387,34 +696,31 @@ class NetworkPlugin(Plugin):
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
                 
-            # Make a HEAD request to get headers
-            headers = {'User-Agent': random.choice(NetworkPlugin.USER_AGENTS)}
-            head_response = requests.head(url, headers=headers, allow_redirects=True)
-            
-            # If output_path is not specified, generate one from URL or Content-Disposition
-            if output_path is None:
-                filename = NetworkPlugin.resolve_filename_from_url(url, head_response.headers)
-                output_path = os.path.join(os.getcwd(), filename)
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-            
-            # Start the download
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            # Get content length if available
-            content_length = int(response.headers.get('Content-Length', 0))
-            
-            # Download the file in chunks
-            downloaded = 0
-            start_time = time.time()
-            
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
+            # Start the download; the connection goes back to the pool on every exit
+            with _SESSION.get(url, stream=True, timeout=(CONNECT_TIMEOUT, 30)) as response:
+                response.raise_for_status()
+                
+                # If output_path is not specified, generate one from URL or Content-Disposition.
+                # The streaming GET already carries the headers, so no separate HEAD is needed.
+                if output_path is None:
+                    filename = NetworkPlugin.resolve_filename_from_url(response.url or url, response.headers)
+                    output_path = os.path.join(os.getcwd(), filename)
+                
+                # Ensure the directory exists
+                os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+                
+                # Get content length if available
+                content_length = int(response.headers.get('Content-Length', 0))
+                
+                # Download the file in chunks
+                downloaded = 0
+                start_time = time.time()
+                
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
             
             # Calculate download time and speed
             download_time = time.time() - start_time
@@ -451,35 +757,25 @@ class NetworkPlugin(Plugin):
         # Try to get filename from Content-Disposition header
         if headers and 'Content-Disposition' in headers:
             content_disposition = headers['Content-Disposition']
-            filename_match = re.search(r'filename=[\'"]?([^\'"\s]+)[\'"]?', content_disposition)
+            filename_match = _CD_UTF8_RE.search(content_disposition)
             if filename_match:
-                return filename_match.group(1)
-        
-        # Try to get filename from URL path
-        parsed_url = urllib.parse.urlparse(url)
-        url_path = parsed_url.path
+                filename = _safe_filename(urllib.parse.unquote(filename_match.group(1)))
+            else:
+                filename_match = _CD_FILENAME_RE.search(content_disposition)
+                filename = _safe_filename(filename_match.group(1)) if filename_match else None
+            # The server picks this name, so it is reduced to a bare filename too
+            if filename:
+                return filename
         
-        # Get the last part of the path
-        filename = os.path.basename(url_path)
+        # Try to get filename from the last part of the URL path, decoding %-escapes
+        filename = _safe_filename(urllib.parse.unquote(urllib.parse.urlsplit(url).path.rsplit('/', 1)[-1]))
         
         # If there's no filename or it has no extension
         if not filename or '.' not in filename:
             # Try to derive from content type
             if headers and 'Content-Type' in headers:
                 content_type = headers['Content-Type'].split(';')[0].strip()
-                ext = {
-                    'text/plain': '.txt',
-                    'text/html': '.html',
-                    'text/css': '.css',
-                    'text/javascript': '.js',
-                    'application/pdf': '.pdf',
-                    'application/json': '.json',
-                    'application/xml': '.xml',
-                    'image/jpeg': '.jpg',
-                    'image/png': '.png',
-                    'image/gif': '.gif',
-                    'application/zip': '.zip'
-                }.get(content_type, '.bin')
+                ext = _CONTENT_TYPE_EXTENSIONS.get(content_type, '.bin')
                 
                 # Use a timestamp as filename
                 timestamp = int(time.time())
@@ -511,19 +807,20 @@ class NetworkPlugin(Plugin):
                 url = 'https://' + url
                 
             # Make a HEAD request to get headers
-            headers = {'User-Agent': random.choice(NetworkPlugin.USER_AGENTS)}
-            response = requests.head(url, headers=headers, allow_redirects=True, timeout=10)
+            headers = _head_headers(url)
             
             # Get the resolved filename
-            filename = NetworkPlugin.resolve_filename_from_url(url, response.headers)
+            filename = NetworkPlugin.resolve_filename_from_url(url, headers)
             
             return {
                 "success": True,
                 "url": url,
                 "resolved_filename": filename,
-                "content_type": response.headers.get('Content-Type', 'unknown'),
-                "content_length": response.headers.get('Content-Length', 'unknown')
+                "content_type": headers.get('Content-Type', 'unknown'),
+                "content_length": headers.get('Content-Length', 'unknown')
             }
             
+        except requests.exceptions.Timeout:
+            return {"success": False, "error": f"Timed out waiting for headers from {url}"}
         except Exception as e:
             return {"success": False, "error": str(e)}
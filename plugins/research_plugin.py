@@ -2,12 +2,149 @@
 Research plugin providing academic paper search and analysis.
 """
 import os
-import requests
 import re
+import copy
 from typing import Dict, Any, List, Optional, Union
 
 from plugins import Plugin, tool, capability
-from core_utils import tool_message_print, tool_report_print  # Updated import path
+from core_utils import tool_message_print, tool_report_print, TTLCache, build_session, CONNECT_TIMEOUT  # Updated import path
+
+# Shared keep-alive session for the arXiv API; transient failures and
+# rate limiting are retried with backoff
+_SESSION = build_session(pool_maxsize=32)
+
+# Paper lookups by (paper_id, return_format); errors are never cached
+_ARXIV_CACHE = TTLCache(maxsize=128, ttl=3600)
+
+_VERSION_SUFFIX_RE = re.compile(r'v\d+$')
+
+_ARXIV_API_URL = "http://export.arxiv.org/api/query"
+
+# XML namespaces used in arXiv API responses
+_ARXIV_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'arxiv': 'http://arxiv.org/schemas/atom'
+}
+
+def _normalize_arxiv_id(paper_id: str) -> str:
+    """Extract the paper ID if a full URL was provided, dropping any version suffix (e.g., v1, v2)."""
+    paper_id = paper_id.strip()
+    if '/' in paper_id:
+        paper_id = paper_id.split('/')[-1]
+        paper_id = _VERSION_SUFFIX_RE.sub('', paper_id)
+    return paper_id
+
+def _parse_arxiv_entry(entry) -> Dict[str, Any]:
+    """Build a paper result from an Atom <entry> element."""
+    ns = _ARXIV_NS
+    
+    # Extract basic information
+    title = entry.find('./atom:title', ns).text.strip()
+    summary = entry.find('./atom:summary', ns).text.strip()
+    published = entry.find('./atom:published', ns).text.strip()
+    
+    # Extract authors
+    authors = []
+    for author_elem in entry.findall('./atom:author', ns):
+        name_elem = author_elem.find('./atom:name', ns)
+        if name_elem is not None:
+            authors.append(name_elem.text.strip())
+            
+    # Extract categories
+    categories = []
+    for cat_elem in entry.findall('./atom:category', ns):
+        if 'term' in cat_elem.attrib:
+            categories.append(cat_elem.attrib['term'])
+            
+    # Extract links
+    links = {}
+    for link_elem in entry.findall('./atom:link', ns):
+        if 'title' in link_elem.attrib and 'href' in link_elem.attrib:
+            links[link_elem.attrib['title']] = link_elem.attrib['href']
+        elif 'rel' in link_elem.attrib and 'href' in link_elem.attrib:
+            links[link_elem.attrib['rel']] = link_elem.attrib['href']
+    
+    return {
+        "title": title,
+        "authors": authors,
+        "published": published,
+        "categories": categories,
+        "summary": summary,
+        "links": links
+    }
+
+def _fetch_arxiv_papers(paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up papers with one Atom API request.
+    
+    Returns results keyed by the requested IDs; IDs arXiv doesn't know are left out.
+    """
+    import xml.etree.ElementTree as ET
+    
+    response = _SESSION.get(
+        _ARXIV_API_URL,
+        params={'id_list': ','.join(paper_ids), 'max_results': len(paper_ids)},
+        timeout=(CONNECT_TIMEOUT, 15)
+    )
+    response.raise_for_status()
+    root = ET.fromstring(response.content)
+    
+    # Entry IDs look like http://arxiv.org/abs/2103.00020v2; index them with and
+    # without the version so both spellings of a requested ID resolve
+    entries = {}
+    for entry in root.findall('./atom:entry', _ARXIV_NS):
+        entry_id = entry.findtext('./atom:id', '', _ARXIV_NS).strip()
+        if '/abs/' not in entry_id:
+            # arXiv reports malformed IDs as entries pointing at its error docs
+            continue
+        versioned_id = entry_id.split('/abs/', 1)[1]
+        entries[versioned_id] = entries[_VERSION_SUFFIX_RE.sub('', versioned_id)] = entry
+    
+    papers = {}
+    for paper_id in paper_ids:
+        entry = entries.get(paper_id)
+        if entry is not None:
+            papers[paper_id] = {"id": paper_id, **_parse_arxiv_entry(entry)}
+    return papers
+
+def _format_arxiv_paper(result: Dict[str, Any]) -> str:
+    """Render a paper result as plain text."""
+    formatted_text = f"Title: {result['title']}\n\n"
+    formatted_text += f"Authors: {', '.join(result['authors'])}\n\n"
+    formatted_text += f"Published: {result['published']}\n\n"
+    formatted_text += f"Categories: {', '.join(result['categories'])}\n\n"
+    formatted_text += f"Summary: {result['summary']}\n\n"
+    
+    # Add links
+    formatted_text += "Links:\n"
+    for link_name, link_url in result['links'].items():
+        formatted_text += f"- {link_name}: {link_url}\n"
+    return formatted_text
+
+# Common section headers in research papers, in matching priority order
+_SECTION_PATTERNS = [
+    r'abstract',
+    r'introduction',
+    r'background',
+    r'related work',
+    r'methodology',
+    r'methods',
+    r'experimental setup',
+    r'experiments',
+    r'results',
+    r'discussion',
+    r'conclusion',
+    r'future work',
+    r'acknowledgments',
+    r'references'
+]
+
+# One case-insensitive scan finds every header name in a line; when a line
+# names several, the earliest entry in _SECTION_PATTERNS wins
+_SECTION_HEADER_RE = re.compile(rf"\b({'|'.join(_SECTION_PATTERNS)})\b", re.IGNORECASE)
+_SECTION_PRIORITY = {pattern: index for index, pattern in enumerate(_SECTION_PATTERNS)}
+_REFERENCE_RE = re.compile(r'\[\d+\]')
+_CITATION_RE = re.compile(r'(?:[A-Z][a-z]+(?:\s+and\s+|\s*,\s*)?)+\s+et\s+al\.?\s*\(\d{4}\)')
 
 class ResearchPlugin(Plugin):
     """Plugin providing research tools."""
@@ -32,94 +169,88 @@ class ResearchPlugin(Plugin):
         tool_message_print(f"Getting arXiv paper: {paper_id}")
         
         try:
-            # Extract paper ID if a full URL was provided
-            if '/' in paper_id:
-                # Extract the paper ID from the URL
-                paper_id = paper_id.split('/')[-1]
-                # Remove any version suffix (e.g., v1, v2)
-                paper_id = re.sub(r'v\d+$', '', paper_id)
-                
-            # Query the arXiv API
-            url = f"http://export.arxiv.org/api/query?id_list={paper_id}"
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            # Parse the response XML
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.text)
-            
-            # Define XML namespaces used in arXiv API
-            ns = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
+            paper_id = _normalize_arxiv_id(paper_id)
             
-            # Extract entry element (contains paper info)
-            entry = root.find('.//atom:entry', ns)
+            cache_key = (paper_id, return_format.lower())
+            cached = _ARXIV_CACHE.get(cache_key)
+            if cached is not None:
+                tool_report_print(f"Using cached paper: {cached['title']}")
+                return copy.deepcopy(cached)
             
-            if entry is None:
+            # Query the arXiv API
+            result = _fetch_arxiv_papers([paper_id]).get(paper_id)
+            if result is None:
                 return {"error": f"Paper {paper_id} not found"}
-                
-            # Extract basic information
-            title = entry.find('./atom:title', ns).text.strip()
-            summary = entry.find('./atom:summary', ns).text.strip()
-            published = entry.find('./atom:published', ns).text.strip()
-            
-            # Extract authors
-            authors = []
-            for author_elem in entry.findall('./atom:author', ns):
-                name_elem = author_elem.find('./atom:name', ns)
-                if name_elem is not None:
-                    authors.append(name_elem.text.strip())
-                    
-            # Extract categories
-            categories = []
-            for cat_elem in entry.findall('./atom:category', ns):
-                if 'term' in cat_elem.attrib:
-                    categories.append(cat_elem.attrib['term'])
-                    
-            # Extract links
-            links = {}
-            for link_elem in entry.findall('./atom:link', ns):
-                if 'title' in link_elem.attrib and 'href' in link_elem.attrib:
-                    links[link_elem.attrib['title']] = link_elem.attrib['href']
-                elif 'rel' in link_elem.attrib and 'href' in link_elem.attrib:
-                    links[link_elem.attrib['rel']] = link_elem.attrib['href']
-            
-            # Format the result
-            result = {
-                "id": paper_id,
-                "title": title,
-                "authors": authors,
-                "published": published,
-                "categories": categories,
-                "summary": summary,
-                "links": links
-            }
             
             # Return just the formatted text content if requested
             if return_format.lower() == "text":
-                formatted_text = f"Title: {title}\n\n"
-                formatted_text += f"Authors: {', '.join(authors)}\n\n"
-                formatted_text += f"Published: {published}\n\n"
-                formatted_text += f"Categories: {', '.join(categories)}\n\n"
-                formatted_text += f"Summary: {summary}\n\n"
-                
-                # Add links
-                formatted_text += "Links:\n"
-                for link_name, link_url in links.items():
-                    formatted_text += f"- {link_name}: {link_url}\n"
-                    
-                result["formatted_text"] = formatted_text
+                result["formatted_text"] = _format_arxiv_paper(result)
                 
             # Print summary
-            tool_report_print(f"Retrieved paper: {title}")
+            tool_report_print(f"Retrieved paper: {result['title']}")
+            
+            _ARXIV_CACHE.set(cache_key, copy.deepcopy(result))
             
             return result
             
         except Exception as e:
             return {"error": f"Error retrieving paper: {e}"}
     
+    @staticmethod
+    @tool(
+        categories=["research", "academic"],
+        requires_network=True,
+        rate_limited=True
+    )
+    def get_arxiv_papers(paper_ids: List[str], return_format: str = "text") -> Dict[str, Any]:
+        """
+        Get information about several arXiv papers with a single API request.
+        
+        Args:
+            paper_ids: arXiv paper IDs or URLs (e.g., ['2311.17096', 'https://arxiv.org/abs/2103.00020'])
+            return_format: Return format, either 'text' (default) or 'full'
+            
+        Returns:
+            Dictionary with the papers found, in request order, and the IDs that weren't found
+        """
+        tool_message_print(f"Getting {len(paper_ids)} arXiv papers")
+        
+        try:
+            paper_ids = list(dict.fromkeys(_normalize_arxiv_id(paper_id) for paper_id in paper_ids))
+            return_format = return_format.lower()
+            
+            # Only query the API for papers that aren't cached
+            papers = {}
+            for paper_id in paper_ids:
+                cached = _ARXIV_CACHE.get((paper_id, return_format))
+                if cached is not None:
+                    papers[paper_id] = copy.deepcopy(cached)
+            
+            missing = [paper_id for paper_id in paper_ids if paper_id not in papers]
+            if missing:
+                fetched = _fetch_arxiv_papers(missing)
+                for paper_id in missing:
+                    result = fetched.get(paper_id)
+                    if result is None:
+                        continue
+                    if return_format == "text":
+                        result["formatted_text"] = _format_arxiv_paper(result)
+                    _ARXIV_CACHE.set((paper_id, return_format), copy.deepcopy(result))
+                    papers[paper_id] = result
+            
+            not_found = [paper_id for paper_id in paper_ids if paper_id not in papers]
+            
+            # Print summary
+            tool_report_print(f"Retrieved {len(papers)} of {len(paper_ids)} papers")
+            
+            return {
+                "papers": [papers[paper_id] for paper_id in paper_ids if paper_id in papers],
+                "not_found": not_found
+            }
+            
+        except Exception as e:
+            return {"error": f"Error retrieving papers: {e}"}
+    
     @staticmethod
     @tool(
         categories=["research", "analysis"],
@@ -138,31 +269,6 @@ class ResearchPlugin(Plugin):
         """
         tool_message_print("Summarizing research paper")
         
-        # List of common section headers in research papers
-        section_patterns = [
-            r'abstract',
-            r'introduction',
-            r'background',
-            r'related work',
-            r'methodology',
-            r'methods',
-            r'experimental setup',
-            r'experiments',
-            r'results',
-            r'discussion',
-            r'conclusion',
-            r'future work',
-            r'acknowledgments',
-            r'references'
-        ]
-        
-        # Compile case-insensitive patterns for section headers
-        # Look for headers that are standalone or followed by a colon or number
-        section_regexes = [
-            re.compile(rf'\b{pattern}\b(?::|\.|\s*\d)?', re.IGNORECASE) 
-            for pattern in section_patterns
-        ]
-        
         # Split text into lines
         lines = text.split('\n')
         
@@ -171,14 +277,14 @@ class ResearchPlugin(Plugin):
         current_section = "preamble"
         sections[current_section] = []
         
-        for i, line in enumerate(lines):
+        for line in lines:
             # Check if the line matches any section header pattern
-            for pattern, regex in zip(section_patterns, section_regexes):
-                if regex.search(line) and len(line.strip()) < 100:  # Avoid matching sentences containing pattern words
-                    current_section = pattern
+            if len(line.strip()) < 100:  # Avoid matching sentences containing pattern words
+                headers = [match.group(1).lower() for match in _SECTION_HEADER_RE.finditer(line)]
+                if headers:
+                    current_section = min(headers, key=_SECTION_PRIORITY.__getitem__)
                     if current_section not in sections:
                         sections[current_section] = []
-                    break
             
             # Add line to current section
             sections[current_section].append(line)
@@ -192,15 +298,13 @@ class ResearchPlugin(Plugin):
         
         # Find and extract any numerical references
         references = []
-        ref_pattern = re.compile(r'\[\d+\]')
-        ref_matches = ref_pattern.findall(text)
+        ref_matches = _REFERENCE_RE.findall(text)
         if ref_matches:
             references = sorted(list(set(ref_matches)))
         
         # Extract potential citations (names with years)
         citations = []
-        citation_pattern = re.compile(r'(?:[A-Z][a-z]+(?:\s+and\s+|\s*,\s*)?)+\s+et\s+al\.?\s*\(\d{4}\)')
-        citation_matches = citation_pattern.findall(text)
+        citation_matches = _CITATION_RE.findall(text)
         if citation_matches:
             citations = sorted(list(set(citation_matches)))[:20]  # Limit to 20 citations max
         
@@ -1,12 +1,74 @@
 """
 Search plugin providing web search and related functionality.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, FrozenSet
 from datetime import datetime
 import os
+import inspect
+import threading
 
 from plugins import Plugin, tool, capability
-from core_utils import tool_message_print, tool_report_print
+from core_utils import tool_message_print, tool_report_print, TTLCache
+
+# Formatted DuckDuckGo results by (query, region, num_results); errors are never cached
+_SEARCH_CACHE = TTLCache(maxsize=256, ttl=300)
+
+# API clients shared across calls so their HTTP sessions (and Reddit's OAuth
+# token) are reused; created on first use since both libraries are optional
+_DDGS = None
+_REDDIT = None
+_CLIENT_LOCK = threading.Lock()
+
+def _get_ddgs():
+    """Return the shared DuckDuckGo search client."""
+    global _DDGS
+    with _CLIENT_LOCK:
+        if _DDGS is None:
+            from duckduckgo_search import DDGS
+            _DDGS = DDGS()
+        return _DDGS
+
+def _get_reddit():
+    """Return the shared Reddit API client, or None if credentials are not configured."""
+    global _REDDIT
+    reddit_id = os.environ.get("REDDIT_ID")
+    reddit_secret = os.environ.get("REDDIT_SECRET")
+    if not reddit_id or not reddit_secret:
+        return None
+    
+    with _CLIENT_LOCK:
+        if _REDDIT is None:
+            import praw
+            _REDDIT = praw.Reddit(
+                client_id=reddit_id,
+                client_secret=reddit_secret,
+                user_agent="gem-assist:v0.1 (by u/gem_assist_bot)"
+            )
+        return _REDDIT
+
+# find_tools lookup data per tool name: (lowercased name, lowercased description,
+# lowercased categories, result entry). Tools never change once registered, so
+# entries are built the first time a tool is seen and reused afterwards.
+_TOOL_INDEX: Dict[str, Tuple[str, str, FrozenSet[str], Dict[str, Any]]] = {}
+
+def _indexed_tool(name: str, func: Callable, capabilities: Dict[str, Any]) -> Tuple[str, str, FrozenSet[str], Dict[str, Any]]:
+    """Return the cached lookup data for a registered tool, building it on first use."""
+    entry = _TOOL_INDEX.get(name)
+    if entry is None:
+        categories = capabilities.get("categories", [])
+        description = capabilities.get("description", "")
+        info = {
+            "name": name,
+            "signature": f"{name}{inspect.signature(func)}",
+            "categories": categories,
+            "description": description,
+            "requires_network": capabilities.get("requires_network", False),
+            "requires_filesystem": capabilities.get("requires_filesystem", False),
+            "rate_limited": capabilities.get("rate_limited", False),
+        }
+        entry = (name.lower(), description.lower(), frozenset(c.lower() for c in categories), info)
+        _TOOL_INDEX[name] = entry
+    return entry
 
 class SearchPlugin(Plugin):
     """Plugin providing search operations."""
@@ -32,17 +94,20 @@ class SearchPlugin(Plugin):
         tool_message_print(f"Searching for: {query}")
         
         try:
-            from duckduckgo_search import DDGS
-            
             # Limit number of results to a reasonable range
             if num_results > 10:
                 num_results = 10
             elif num_results < 1:
                 num_results = 1
+            
+            cache_key = (query.strip(), region, num_results)
+            cached = _SEARCH_CACHE.get(cache_key)
+            if cached is not None:
+                tool_report_print(f"Using cached results for query: '{query}'")
+                return [dict(result) for result in cached]
                 
             # Perform search
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, region=region, safesearch="moderate", max_results=num_results))
+            results = list(_get_ddgs().text(query, region=region, safesearch="moderate", max_results=num_results))
                 
             # Format results
             formatted_results = []
@@ -56,6 +121,8 @@ class SearchPlugin(Plugin):
             # Print results summary
             tool_report_print(f"Found {len(formatted_results)} results for query: '{query}'")
             
+            _SEARCH_CACHE.set(cache_key, [dict(result) for result in formatted_results])
+            
             return formatted_results
             
         except Exception as e:
@@ -84,22 +151,10 @@ class SearchPlugin(Plugin):
         tool_message_print(f"Searching Reddit for: {query}")
         
         try:
-            import praw
-            import os
-            
-            # Get Reddit credentials
-            reddit_id = os.environ.get("REDDIT_ID")
-            reddit_secret = os.environ.get("REDDIT_SECRET")
-            
-            if not reddit_id or not reddit_secret:
+            # Get the shared Reddit API client
+            reddit = _get_reddit()
+            if reddit is None:
                 return [{"error": "Reddit API credentials are not configured"}]
-                
-            # Initialize Reddit API client
-            reddit = praw.Reddit(
-                client_id=reddit_id,
-                client_secret=reddit_secret,
-                user_agent="gem-assist:v0.1 (by u/gem_assist_bot)"
-            )
             
             # Perform search
             if subreddit:
@@ -154,22 +209,10 @@ class SearchPlugin(Plugin):
         tool_message_print(f"Getting Reddit post: {post_id}")
         
         try:
-            import praw
-            import os
-            
-            # Get Reddit credentials
-            reddit_id = os.environ.get("REDDIT_ID")
-            reddit_secret = os.environ.get("REDDIT_SECRET")
-            
-            if not reddit_id or not reddit_secret:
+            # Get the shared Reddit API client
+            reddit = _get_reddit()
+            if reddit is None:
                 return {"error": "Reddit API credentials are not configured"}
-                
-            # Initialize Reddit API client
-            reddit = praw.Reddit(
-                client_id=reddit_id,
-                client_secret=reddit_secret,
-                user_agent="gem-assist:v0.1 (by u/gem_assist_bot)"
-            )
             
             # Get the post
             post = reddit.submission(id=post_id)
@@ -221,22 +264,10 @@ class SearchPlugin(Plugin):
         tool_message_print(f"Getting comments for Reddit post: {post_id}")
         
         try:
-            import praw
-            import os
-            
-            # Get Reddit credentials
-            reddit_id = os.environ.get("REDDIT_ID")
-            reddit_secret = os.environ.get("REDDIT_SECRET")
-            
-            if not reddit_id or not reddit_secret:
+            # Get the shared Reddit API client
+            reddit = _get_reddit()
+            if reddit is None:
                 return [{"error": "Reddit API credentials are not configured"}]
-                
-            # Initialize Reddit API client
-            reddit = praw.Reddit(
-                client_id=reddit_id,
-                client_secret=reddit_secret,
-                user_agent="gem-assist:v0.1 (by u/gem_assist_bot)"
-            )
             
             # Get the post and comments
             post = reddit.submission(id=post_id)
@@ -294,39 +325,25 @@ class SearchPlugin(Plugin):
         registry = get_registry()
         tools = registry.get_tools()
         
+        category_lower = category.lower() if category else None
+        keyword_lower = keyword.lower() if keyword else None
+        
         results = []
         for name, func in tools.items():
-            capabilities = registry.get_capabilities(name)
+            name_lower, description_lower, categories_lower, info = _indexed_tool(
+                name, func, registry.get_capabilities(name)
+            )
             
             # Filter by category if provided
-            if category:
-                tool_categories = capabilities.get("categories", [])
-                if category.lower() not in [c.lower() for c in tool_categories]:
-                    continue
+            if category_lower and category_lower not in categories_lower:
+                continue
             
             # Filter by keyword in name or description if provided
-            if keyword:
-                keyword_lower = keyword.lower()
-                name_match = keyword_lower in name.lower()
-                desc_match = keyword_lower in capabilities.get("description", "").lower()
-                
-                if not (name_match or desc_match):
-                    continue
-            
-            # Get function signature
-            import inspect
-            signature = str(inspect.signature(func))
+            if keyword_lower and keyword_lower not in name_lower and keyword_lower not in description_lower:
+                continue
             
-            # Add to results
-            results.append({
-                "name": name,
-                "signature": f"{name}{signature}",
-                "categories": capabilities.get("categories", []),
-                "description": capabilities.get("description", ""),
-                "requires_network": capabilities.get("requires_network", False),
-                "requires_filesystem": capabilities.get("requires_filesystem", False),
-                "rate_limited": capabilities.get("rate_limited", False),
-            })
+            # Copy so callers can't modify the cached entry
+            results.append({**info, "categories": list(info["categories"])})
         
         # Sort by name
         results.sort(key=lambda x: x["name"])
@@ -1,12 +1,160 @@
 """
 Web scraper plugin providing advanced web content extraction capabilities.
 """
+import io
 import time
 import re
-from typing import Dict, List, Any, Optional, Union
+import copy
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Union
 
 from plugins import Plugin, tool, capability
-from core_utils import tool_message_print, tool_report_print
+from core_utils import (
+    tool_message_print, tool_report_print, normalize_url, TTLCache,
+    build_session, declared_charset, read_capped, CONNECT_TIMEOUT
+)
+
+# Successful smart_content_extraction results by URL; errors are never cached
+_SMART_EXTRACTION_CACHE = TTLCache(maxsize=256, ttl=600)
+
+# Shared keep-alive session, created on first use since requests is an optional extra
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+def _get_session():
+    """Return the shared scraping session with pooled connections and retries."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = build_session(user_agent=_USER_AGENT)
+        return _SESSION
+
+# Paragraphs shorter than this are usually captions, buttons or bylines
+_MIN_PARAGRAPH_LENGTH = 15
+_BLOCK_TAGS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+_SOUP_CONTENT_TAGS = ['title', 'meta', 'body']
+_UNWANTED_TAGS = ['script', 'style', 'nav', 'footer', 'iframe', 'noscript', 'form']
+# Main content containers in priority order; divs only count with one of the classes
+_MAIN_CONTENT_TAGS = ['article', 'main', 'div']
+_MAIN_CONTENT_CLASSES = frozenset({'content', 'main', 'article', 'post', 'body', 'entry', 'text'})
+
+try:
+    from lxml import etree
+    # Block elements below the main content node, in document order
+    _BLOCK_XPATH = etree.XPath('|'.join(f'.//{tag}' for tag in _BLOCK_TAGS))
+    # Only the <meta> elements _page_metadata keeps
+    _META_XPATH = etree.XPath("//meta[starts-with(@property, 'og:') or @name='description']")
+except ImportError:
+    _BLOCK_XPATH = _META_XPATH = None
+
+# Class names of ads, sharing widgets and other page chrome (matched anywhere in the class)
+_AD_CLASS_RE = re.compile(
+    r'ad|ads|advertisement|banner|sidebar|social|share|comment|comments|footer',
+    re.IGNORECASE
+)
+
+def _page_metadata(meta_tags) -> Dict[str, str]:
+    """Collect Open Graph properties and the description from <meta> elements."""
+    metadata = {}
+    for meta in meta_tags:
+        property_value = meta.get('property', '') or ''
+        if property_value.startswith('og:'):
+            metadata[property_value] = meta.get('content', '')
+            
+        # Also check for description
+        if meta.get('name') == 'description':
+            metadata['description'] = meta.get('content', '')
+    return metadata
+
+def _extract_with_readability(
+    html: Union[str, bytes],
+    url: str,
+    encoding: Optional[str] = None
+) -> Optional[Tuple[str, Dict[str, str], List[str]]]:
+    """
+    Locate the main content with readability-lxml and collect its block text.
+    
+    Returns None when readability is not installed or cannot score the page.
+    """
+    try:
+        import lxml.html
+        from readability import Document
+        from readability.readability import Unparseable
+    except ImportError:
+        return None
+    
+    try:
+        tree = lxml.html.document_fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+    except (ValueError, lxml.etree.ParserError):
+        return None
+    
+    # Read head metadata before readability strips the tree down
+    title = tree.findtext('.//title')
+    metadata = _page_metadata(_META_XPATH(tree))
+    
+    try:
+        main_html = Document(tree, url=url).summary(html_partial=True)
+    except Unparseable:
+        return None
+    
+    main = lxml.html.fromstring(main_html)
+    paragraphs = []
+    for element in _BLOCK_XPATH(main):
+        text = element.text_content().strip()
+        if len(text) > _MIN_PARAGRAPH_LENGTH:
+            paragraphs.append(text)
+    
+    return (title if title is not None else "No title found"), metadata, paragraphs
+
+def _extract_with_soup(html: Union[str, bytes], encoding: Optional[str] = None) -> Tuple[str, Dict[str, str], List[str]]:
+    """Locate the main content with tag/class heuristics and collect its block text."""
+    from bs4 import BeautifulSoup, SoupStrainer
+    
+    # Head content other than the title and meta tags never enters the tree
+    soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer(_SOUP_CONTENT_TAGS), from_encoding=encoding)
+    
+    # Remove unwanted elements
+    for element in soup.find_all(_UNWANTED_TAGS):
+        element.decompose()
+        
+    # Extract title
+    title = soup.find('title')
+    title_text = title.get_text() if title else "No title found"
+    
+    # Extract Open Graph metadata
+    metadata = _page_metadata(soup.find_all('meta'))
+    
+    # Remove common ads and navigation elements in a single tree walk
+    for element in soup.find_all(class_=_AD_CLASS_RE):
+        if not element.decomposed:
+            element.decompose()
+    
+    # Try to find main content (priority to article, main, or content divs) in one tree walk
+    main_content = None
+    best_rank = len(_MAIN_CONTENT_TAGS)
+    for element in soup.find_all(_MAIN_CONTENT_TAGS):
+        if element.name == 'div' and _MAIN_CONTENT_CLASSES.isdisjoint(element.get('class', [])):
+            continue
+        rank = _MAIN_CONTENT_TAGS.index(element.name)
+        if rank < best_rank:
+            main_content, best_rank = element, rank
+            if rank == 0:
+                break
+    
+    # If no main content found, use body
+    if not main_content:
+        main_content = soup.body
+    
+    # Extract text with paragraph structure
+    paragraphs = []
+    if main_content:
+        for p in main_content.find_all(_BLOCK_TAGS):
+            text = p.get_text(strip=True)
+            if text and len(text) > _MIN_PARAGRAPH_LENGTH:  # Filter out very short paragraphs
+                paragraphs.append(text)
+    
+    return title_text, metadata, paragraphs
 
 class WebScraperPlugin(Plugin):
     """Plugin providing web scraping operations."""
@@ -34,16 +182,15 @@ class WebScraperPlugin(Plugin):
         tool_message_print(f"Extracting structured data from: {url}")
         
         try:
-            import requests
             from bs4 import BeautifulSoup
             
             # Make the request with a reasonable timeout
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            with _get_session().get(url, timeout=(CONNECT_TIMEOUT, 15), stream=True) as response:
+                response.raise_for_status()
+                body = read_capped(response)
             
             # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(body, 'lxml', from_encoding=declared_charset(response))
             
             # Extract data based on selectors
             result = {}
@@ -92,16 +239,15 @@ class WebScraperPlugin(Plugin):
         tool_message_print(f"Extracting tables from: {url}")
         
         try:
-            import requests
             import pandas as pd
             
             # Make the request
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
+            with _get_session().get(url, timeout=(CONNECT_TIMEOUT, 15), stream=True) as response:
+                response.raise_for_status()
+                body = read_capped(response)
             
-            # Read HTML tables
-            tables = pd.read_html(response.text)
+            # Read HTML tables from the raw bytes; the parser handles the charset
+            tables = pd.read_html(io.BytesIO(body), encoding=declared_charset(response))
             
             if not tables:
                 return {
@@ -180,7 +326,6 @@ class WebScraperPlugin(Plugin):
         tool_message_print(f"Scraping paginated content from: {base_url}")
         
         try:
-            import requests
             from bs4 import BeautifulSoup
             
             results = {
@@ -195,18 +340,19 @@ class WebScraperPlugin(Plugin):
                 url_format = base_url + f"?{page_param}={{}}"
             
             # Process each page
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-            
-            for page_num in range(start_page, start_page + max_pages):
+            session = _get_session()
+            last_page = start_page + max_pages - 1
+            for page_num in range(start_page, last_page + 1):
                 # Format the page URL
                 page_url = url_format.format(page_num)
                 
                 # Make the request
-                response = requests.get(page_url, headers=headers, timeout=15)
-                response.raise_for_status()
+                with session.get(page_url, timeout=(CONNECT_TIMEOUT, 15), stream=True) as response:
+                    response.raise_for_status()
+                    body = read_capped(response)
                 
                 # Parse the content
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(body, 'lxml', from_encoding=declared_charset(response))
                 content = soup.select(content_selector)
                 
                 page_content = "".join(str(element) for element in content)
@@ -221,8 +367,9 @@ class WebScraperPlugin(Plugin):
                     "content": text_content[:1000] + ("..." if len(text_content) > 1000 else "")
                 })
                 
-                # Add a short delay to avoid overloading the server
-                time.sleep(1)
+                # Add a short delay between pages to avoid overloading the server
+                if page_num < last_page:
+                    time.sleep(1)
                 
             # Print summary
             tool_report_print(f"Scraped {len(results['pages'])} pages from {base_url}")
@@ -333,70 +480,24 @@ class WebScraperPlugin(Plugin):
         """
         tool_message_print(f"Extracting smart content from: {url}")
         
+        cache_key = normalize_url(url)
+        cached = _SMART_EXTRACTION_CACHE.get(cache_key)
+        if cached is not None:
+            tool_report_print(f"Using cached content for {url}")
+            return copy.deepcopy(cached)
+        
         try:
-            import requests
-            import re
-            from bs4 import BeautifulSoup
-            
             # Make the request
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'}
-            response = requests.get(url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup.find_all(['script', 'style', 'nav', 'footer', 'iframe', 'noscript', 'form']):
-                element.decompose()
-                
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text() if title else "No title found"
-            
-            # Extract metadata
-            metadata = {}
-            
-            # Extract Open Graph metadata
-            for meta in soup.find_all('meta'):
-                property_value = meta.get('property', '')
-                if property_value.startswith('og:'):
-                    metadata[property_value] = meta.get('content', '')
-                    
-                # Also check for description
-                if meta.get('name') == 'description':
-                    metadata['description'] = meta.get('content', '')
-            
-            # Remove common ads and navigation elements
-            ad_classes = ['ad', 'ads', 'advertisement', 'banner', 'sidebar', 'social', 'share', 'comment', 'comments', 'footer']
-            for class_name in ad_classes:
-                for element in soup.find_all(class_=re.compile(class_name, re.IGNORECASE)):
-                    element.decompose()
-            
-            # Try to find main content (priority to article, main, or content divs)
-            main_content = None
-            for tag in ['article', 'main', 'div']:
-                for element in soup.find_all(tag):
-                    if (tag == 'div' and any(c in element.get('class', []) for c in ['content', 'main', 'article', 'post', 'body', 'entry', 'text'])):
-                        main_content = element
-                        break
-                    elif tag != 'div':
-                        main_content = element
-                        break
-                if main_content:
-                    break
-            
-            # If no main content found, use body
-            if not main_content:
-                main_content = soup.body
+            with _get_session().get(url, timeout=(CONNECT_TIMEOUT, 15), stream=True) as response:
+                response.raise_for_status()
+                html = read_capped(response)
             
-            # Extract text with paragraph structure
-            paragraphs = []
-            if main_content:
-                for p in main_content.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 15:  # Filter out very short paragraphs
-                        paragraphs.append(text)
+            # Prefer readability's content scoring; fall back to selector heuristics
+            encoding = declared_charset(response)
+            extracted = _extract_with_readability(html, url, encoding)
+            if extracted is None:
+                extracted = _extract_with_soup(html, encoding)
+            title_text, metadata, paragraphs = extracted
             
             # Build the result
             result = {
@@ -412,6 +513,8 @@ class WebScraperPlugin(Plugin):
             # Print summary
             tool_report_print(f"Extracted {len(paragraphs)} paragraphs ({result['content_length']} chars) from {url}")
             
+            _SMART_EXTRACTION_CACHE.set(cache_key, copy.deepcopy(result))
+            
             return result
             
         except Exception as e:
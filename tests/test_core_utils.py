@@ -0,0 +1,63 @@
+"""
+Tests for shared core utilities.
+"""
+from core_utils import TTLCache, normalize_url, read_capped, build_session
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """Entries are dropped once their time-to-live has passed."""
+    now = [100.0]
+    monkeypatch.setattr("core_utils.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+
+    now[0] += 30
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+def test_ttl_cache_evicts_least_recently_used():
+    """The least recently used entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+def test_normalize_url_ignores_fragment_and_query_order():
+    """Equivalent spellings of a URL share one cache key."""
+    assert normalize_url("HTTPS://Example.com/page?b=2&a=1#section") == normalize_url("https://example.com/page?a=1&b=2")
+    assert normalize_url("https://example.com") == "https://example.com/"
+
+def test_read_capped_stops_after_limit_and_closes():
+    """Reading stops once the limit is passed and the response is released."""
+    class StreamedResponse:
+        closed = False
+
+        def iter_content(self, chunk_size=1):
+            while True:
+                yield b"x" * chunk_size
+
+        def close(self):
+            self.closed = True
+
+    response = StreamedResponse()
+    body = read_capped(response, limit=100000)
+
+    assert 100000 < len(body) <= 100000 + 65536
+    assert response.closed
+
+def test_build_session_retries_only_error_statuses():
+    """Connect and read failures are raised at once, so per-call timeouts stay real bounds."""
+    session = build_session(user_agent="test-agent")
+    retry = session.get_adapter("https://example.com/").max_retries
+
+    assert session.headers["User-Agent"] == "test-agent"
+    assert retry.connect is False and retry.read is False
+    assert retry.respect_retry_after_header is False
+    assert 503 in retry.status_forcelist
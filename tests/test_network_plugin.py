@@ -0,0 +1,445 @@
+"""
+Tests for the network plugin helpers.
+"""
+import json
+import socket
+import threading
+
+import pytest
+
+from plugins import network_plugin
+from plugins.network_plugin import NetworkPlugin
+
+class MockResponse:
+    """Minimal stand-in for a requests.Response."""
+    def __init__(self, status_code=200, content=b"", headers=None, url="https://example.com/"):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.content = content
+        self.headers = headers or {}
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+@pytest.fixture(autouse=True)
+def clear_url_cache():
+    """Start every test with empty page and header caches."""
+    network_plugin._URL_CACHE.clear()
+    network_plugin._HEAD_CACHE.clear()
+    yield
+    network_plugin._URL_CACHE.clear()
+    network_plugin._HEAD_CACHE.clear()
+
+def test_conditional_get_reuses_cached_text(monkeypatch):
+    """A 304 response returns the previously extracted text."""
+    html = b"<html><body><p>Hello cache</p></body></html>"
+    sent_headers = []
+
+    def fake_get(url, headers=None, **kwargs):
+        sent_headers.append(dict(headers or {}))
+        if len(sent_headers) == 1:
+            return MockResponse(content=html, headers={"ETag": '"abc"'})
+        return MockResponse(status_code=304)
+
+    monkeypatch.setattr(network_plugin._SESSION, "get", fake_get)
+    # Expire entries immediately so the second call has to revalidate
+    monkeypatch.setattr(network_plugin, "_URL_CACHE_TTL", 0)
+
+    first = NetworkPlugin.get_website_text_content("https://example.com/")
+    second = NetworkPlugin.get_website_text_content("https://example.com/")
+
+    assert "Hello cache" in first
+    assert second == first
+    assert "If-None-Match" not in sent_headers[0]
+    assert sent_headers[1]["If-None-Match"] == '"abc"'
+
+def test_fresh_cache_entries_skip_the_network(monkeypatch):
+    """Pages fetched within the TTL are returned without a request."""
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return MockResponse(content=b"<html><body><p>Fresh</p></body></html>")
+
+    monkeypatch.setattr(network_plugin._SESSION, "get", fake_get)
+
+    first = NetworkPlugin.get_website_text_content("https://example.com/")
+    second = NetworkPlugin.get_website_text_content("https://example.com/")
+
+    assert first == second == "Fresh"
+    assert len(calls) == 1
+
+def test_page_text_skips_non_content_elements(monkeypatch):
+    """Scripts, navigation and head metadata are dropped from the page text."""
+    html = (
+        "<html><head><meta charset='utf-8'><title>Caf\u00e9</title><style>p {}</style></head>"
+        "<body><nav>Menu</nav><p>First paragraph</p><!-- note --><script>var x;</script>"
+        "<p>Second paragraph</p><footer>Footer</footer></body></html>"
+    ).encode("utf-8")
+
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: MockResponse(content=html, headers={"Content-Type": "text/html"})
+    )
+
+    text = NetworkPlugin.get_website_text_content("https://example.com/")
+
+    assert text == "Caf\u00e9\nFirst paragraph\nSecond paragraph"
+
+def test_page_text_stops_reading_oversized_pages(monkeypatch):
+    """Bodies beyond the size cap are not downloaded or parsed."""
+    html = b"<html><body><p>Start</p>" + b"<p>filler</p>" * 10000 + b"<p>End</p></body></html>"
+    monkeypatch.setattr(network_plugin._SESSION, "get", lambda url, **kwargs: MockResponse(content=html))
+    monkeypatch.setattr(network_plugin, "MAX_PAGE_BYTES", 1024)
+
+    text = NetworkPlugin.get_website_text_content("https://example.com/")
+
+    assert text.startswith("Start")
+    assert "End" not in text
+
+@pytest.mark.parametrize("video_url, expected", [
+    ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42", "dQw4w9WgXcQ"),
+    ("https://youtu.be/dQw4w9WgXcQ?si=abc", "dQw4w9WgXcQ"),
+    ("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+    ("https://www.youtube.com/channel/xyz", None),
+])
+def test_extract_youtube_video_id(video_url, expected):
+    """Video IDs are found in all supported URL forms."""
+    assert network_plugin._extract_youtube_video_id(video_url) == expected
+
+@pytest.mark.parametrize("content_disposition, expected", [
+    ('attachment; filename="report.pdf"', "report.pdf"),
+    ("attachment; filename=data.csv; size=10", "data.csv"),
+    ("attachment; filename*=UTF-8''na%C3%AFve%20notes.txt", "naïve notes.txt"),
+])
+def test_resolve_filename_from_content_disposition(content_disposition, expected):
+    """Content-Disposition filenames take precedence over the URL path."""
+    headers = {"Content-Disposition": content_disposition}
+    assert NetworkPlugin.resolve_filename_from_url("https://example.com/download", headers) == expected
+
+def test_resolve_filename_decodes_url_path():
+    """Percent-escapes in the URL path are decoded, and query and fragment ignored."""
+    url = "https://example.com/files/Annual%20Report.pdf?download=1#page=2"
+    assert NetworkPlugin.resolve_filename_from_url(url) == "Annual Report.pdf"
+
+def test_fetch_youtube_title_uses_oembed(monkeypatch):
+    """The title comes from the small oEmbed JSON response when it is available."""
+    requested = []
+
+    def fake_get(url, **kwargs):
+        requested.append(url)
+        return MockResponse(content=b'{"title": "Tom & Jerry"}')
+
+    monkeypatch.setattr(network_plugin._SESSION, "get", fake_get)
+
+    assert network_plugin._fetch_youtube_title("dQw4w9WgXcQ") == "Tom & Jerry"
+    assert requested == [network_plugin._YT_OEMBED_URL]
+
+def test_fetch_youtube_title_reads_only_page_head(monkeypatch):
+    """Without oEmbed, the title is scanned from the first chunks of the watch page."""
+    page = b"<html><head><title>Tom &amp; Jerry - YouTube</title></head>" + b"<p>x</p>" * 20000
+
+    def fake_get(url, **kwargs):
+        if url == network_plugin._YT_OEMBED_URL:
+            return MockResponse(status_code=401, content=b"Unauthorized")
+        return MockResponse(content=page)
+
+    monkeypatch.setattr(network_plugin._SESSION, "get", fake_get)
+
+    assert network_plugin._fetch_youtube_title("dQw4w9WgXcQ") == "Tom & Jerry"
+
+@pytest.mark.parametrize("content_type, body, expected", [
+    ("application/json", '{"name": "café"}'.encode("utf-8"), '{"name": "café"}'),
+    ("text/plain; charset=iso-8859-1", "café".encode("latin-1"), "café"),
+    ("text/plain; charset=bogus", "café".encode("utf-8"), "café"),
+])
+def test_response_text_uses_declared_charset(content_type, body, expected):
+    """Bodies decode with the declared charset, or UTF-8 when none is usable."""
+    response = MockResponse(content=body, headers={"Content-Type": content_type})
+    assert network_plugin._response_text(response) == expected
+
+def test_download_names_file_from_get_response(monkeypatch, tmp_path):
+    """The filename comes from the download response itself, without a HEAD request."""
+    def fail_head(url, **kwargs):
+        raise AssertionError("unexpected HEAD request")
+
+    monkeypatch.setattr(network_plugin._SESSION, "head", fail_head)
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: MockResponse(
+            content=b"a,b\n1,2\n",
+            headers={"Content-Disposition": 'attachment; filename="data.csv"'},
+            url=url
+        )
+    )
+    monkeypatch.chdir(tmp_path)
+
+    result = NetworkPlugin.download_file_from_url("https://example.com/export?id=3")
+
+    assert result["success"] is True
+    assert (tmp_path / "data.csv").read_bytes() == b"a,b\n1,2\n"
+
+def test_rotate_user_agent_cycles_through_all_agents():
+    """Rotation visits every user agent before repeating one."""
+    seen = {network_plugin.rotate_user_agent() for _ in network_plugin.USER_AGENTS}
+
+    assert seen == set(network_plugin.USER_AGENTS)
+    assert network_plugin._SESSION.headers["User-Agent"] in seen
+
+@pytest.fixture
+def silent_server():
+    """A local socket that accepts connections but never answers; yields (url, connections)."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    connections = []
+
+    def accept():
+        while True:
+            try:
+                connections.append(server.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/file", connections
+    server.close()
+    for connection in connections:
+        connection.close()
+
+def test_try_resolve_filename_reports_timeouts(monkeypatch, silent_server):
+    """A HEAD request that times out is reported as such, without being retried."""
+    url, connections = silent_server
+    session_head = network_plugin._SESSION.head
+    # Keep the real session and adapter, only shorten the read timeout
+    monkeypatch.setattr(
+        network_plugin._SESSION, "head",
+        lambda url, **kwargs: session_head(url, **{**kwargs, "timeout": (1, 0.2)})
+    )
+
+    result = NetworkPlugin.try_resolve_filename_from_url(url)
+
+    assert result == {"success": False, "error": f"Timed out waiting for headers from {url}"}
+    assert len(connections) == 1
+
+def test_head_headers_cache_only_successful_responses(monkeypatch):
+    """Failed HEAD responses are retried instead of being served from the cache."""
+    statuses = [503, 200, 200]
+    calls = []
+
+    def fake_head(url, **kwargs):
+        calls.append(url)
+        return MockResponse(status_code=statuses[len(calls) - 1], headers={"Content-Type": "application/pdf"}, url=url)
+
+    monkeypatch.setattr(network_plugin._SESSION, "head", fake_head)
+
+    for _ in statuses:
+        network_plugin._head_headers("https://example.com/file#top")
+
+    assert len(calls) == 2
+
+def test_session_retries_ignore_retry_after():
+    """Retries use the backoff schedule rather than sleeping for a server's Retry-After."""
+    retry = network_plugin._SESSION.get_adapter("https://example.com/").max_retries
+    assert retry.respect_retry_after_header is False
+    assert 429 in retry.status_forcelist
+
+@pytest.mark.parametrize("charset", ["utf8mb4", "none", "win-1251"])
+def test_page_text_ignores_unknown_charsets(monkeypatch, charset):
+    """An unknown declared charset falls back to sniffing instead of failing the fetch."""
+    html = "<html><head><meta charset='utf-8'></head><body><p>Café</p></body></html>".encode("utf-8")
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: MockResponse(content=html, headers={"Content-Type": f"text/html; charset={charset}"})
+    )
+
+    assert NetworkPlugin.get_website_text_content("https://example.com/") == "Café"
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/download/file.pdf",
+    "https://example.com/export.php?id=1",
+])
+def test_download_prefers_content_disposition_over_url(monkeypatch, tmp_path, url):
+    """A Content-Disposition filename wins even when the URL path has an extension."""
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: MockResponse(
+            content=b"a,b\n",
+            headers={"Content-Disposition": 'attachment; filename="report-2024.csv"'},
+            url=url
+        )
+    )
+    monkeypatch.chdir(tmp_path)
+
+    result = NetworkPlugin.download_file_from_url(url)
+
+    assert result["file_path"] == str(tmp_path / "report-2024.csv")
+
+def test_download_closes_response_on_http_error(monkeypatch, tmp_path):
+    """A failed download still releases its pooled connection."""
+    closed = []
+
+    class FailingResponse(MockResponse):
+        def __exit__(self, *args):
+            closed.append(True)
+            return False
+
+    monkeypatch.setattr(network_plugin._SESSION, "get", lambda url, **kwargs: FailingResponse(status_code=404))
+    monkeypatch.chdir(tmp_path)
+
+    result = NetworkPlugin.download_file_from_url("https://example.com/missing.pdf")
+
+    assert result == {"success": False, "error": "HTTP 404"}
+    assert closed == [True]
+
+def test_page_text_closes_every_streamed_response(monkeypatch):
+    """Both a 304 with an evicted cache entry and the failing re-fetch are closed."""
+    closed = []
+    statuses = [304, 500]
+
+    class TrackedResponse(MockResponse):
+        def close(self):
+            closed.append(self.status_code)
+
+        def __exit__(self, *args):
+            self.close()
+            return False
+
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: TrackedResponse(status_code=statuses.pop(0))
+    )
+
+    text = NetworkPlugin.get_website_text_content("https://example.com/")
+
+    assert text == "Error fetching website: HTTP 500"
+    assert closed == [304, 500]
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://example.com/..%2F..%2F.bashrc", ".bashrc"),
+    ("https://example.com/%2Fetc%2Fcron.d%2Fjob", "job"),
+    ("https://example.com/files/..%5C..%5Cevil.exe", "evil.exe"),
+])
+def test_resolve_filename_strips_directories_from_url_path(url, expected):
+    """Encoded separators in the URL path cannot point outside the download directory."""
+    assert NetworkPlugin.resolve_filename_from_url(url) == expected
+
+def test_resolve_filename_rejects_dot_segments_from_url_path():
+    """A path that decodes to '..' falls back to a generated name."""
+    filename = NetworkPlugin.resolve_filename_from_url("https://example.com/a/..%2F..")
+    assert filename.startswith("download_") and filename.endswith(".bin")
+
+def test_download_stays_in_working_directory_after_redirect(monkeypatch, tmp_path):
+    """A redirect to a traversal URL still saves inside the working directory."""
+    monkeypatch.setattr(
+        network_plugin._SESSION, "get",
+        lambda url, **kwargs: MockResponse(content=b"x", url="https://example.com/%2Ftmp%2F..%2Fevil.sh")
+    )
+    monkeypatch.chdir(tmp_path)
+
+    result = NetworkPlugin.download_file_from_url("https://example.com/file")
+
+    assert result["file_path"] == str(tmp_path / "evil.sh")
+
+@pytest.mark.parametrize("content_disposition, expected", [
+    ("attachment; filename*=UTF-8''..%2F..%2Fevil.sh", "evil.sh"),
+    ("attachment; filename*=UTF-8''%2Fetc%2Fpasswd", "passwd"),
+    ('attachment; filename="../../evil.sh"', "evil.sh"),
+    ("attachment; filename=/etc/cron.d/job.sh", "job.sh"),
+])
+def test_content_disposition_filenames_cannot_escape_directory(content_disposition, expected):
+    """Server-supplied Content-Disposition names are reduced to a bare filename."""
+    headers = {"Content-Disposition": content_disposition}
+    assert NetworkPlugin.resolve_filename_from_url("https://example.com/download", headers) == expected
+
+def test_content_disposition_dot_segments_fall_back_to_url():
+    """A Content-Disposition name of '..' is ignored in favour of the URL path."""
+    headers = {"Content-Disposition": "attachment; filename*=UTF-8''..%2F.."}
+    assert NetworkPlugin.resolve_filename_from_url("https://example.com/report.pdf", headers) == "report.pdf"
+
+def _no_popen(*args, **kwargs):
+    raise AssertionError("unexpected opener process")
+
+def test_url_opener_needs_a_display_on_linux(monkeypatch):
+    """Without DISPLAY or WAYLAND_DISPLAY, xdg-open is not launched."""
+    monkeypatch.setattr(network_plugin.sys, "platform", "linux")
+    monkeypatch.delenv("DISPLAY", raising=False)
+    monkeypatch.delenv("WAYLAND_DISPLAY", raising=False)
+    monkeypatch.setattr(network_plugin.shutil, "which", lambda command: "/usr/bin/" + command)
+    monkeypatch.setattr(network_plugin.subprocess, "Popen", _no_popen)
+
+    assert network_plugin._spawn_url_opener("https://example.com/") is False
+
+def test_url_opener_spawns_xdg_open_in_a_graphical_session(monkeypatch):
+    """With a display, the URL is handed to xdg-open."""
+    launched = []
+    monkeypatch.setattr(network_plugin.sys, "platform", "linux")
+    monkeypatch.setenv("WAYLAND_DISPLAY", "wayland-0")
+    monkeypatch.setattr(network_plugin.shutil, "which", lambda command: "/usr/bin/" + command)
+    monkeypatch.setattr(network_plugin.subprocess, "Popen", lambda args, **kwargs: launched.append(args))
+
+    assert network_plugin._spawn_url_opener("https://example.com/") is True
+    assert launched == [["/usr/bin/xdg-open", "https://example.com/"]]
+
+@pytest.mark.parametrize("browser_class, in_background", [
+    ("GenericBrowser", False),
+    ("BackgroundBrowser", True),
+])
+def test_open_url_runs_console_browsers_in_foreground(monkeypatch, browser_class, in_background):
+    """Console browsers keep the terminal synchronously; GUI browsers launch in the background."""
+    import webbrowser
+
+    opened = threading.Event()
+    threads = []
+
+    class RecordingBrowser(getattr(webbrowser, browser_class)):
+        def open(self, url, new=0, autoraise=True):
+            threads.append(threading.current_thread())
+            opened.set()
+            return True
+
+    monkeypatch.setattr(network_plugin, "_spawn_url_opener", lambda url: False)
+    monkeypatch.setattr(webbrowser, "get", lambda: RecordingBrowser("browser"))
+
+    result = NetworkPlugin.open_url("https://example.com/")
+
+    assert result["success"] is True
+    assert opened.wait(1)
+    assert (threads[0] is not threading.main_thread()) == in_background
+
+def test_open_url_reports_console_browser_failure(monkeypatch):
+    """A console browser that fails to start is reported as a failure."""
+    import webbrowser
+
+    class FailingBrowser(webbrowser.GenericBrowser):
+        def open(self, url, new=0, autoraise=True):
+            return False
+
+    monkeypatch.setattr(network_plugin, "_spawn_url_opener", lambda url: False)
+    monkeypatch.setattr(webbrowser, "get", lambda: FailingBrowser("w3m"))
+
+    assert NetworkPlugin.open_url("https://example.com/") == {"success": False, "error": "Failed to open URL in browser"}
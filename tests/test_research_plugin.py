@@ -0,0 +1,88 @@
+"""
+Tests for the research plugin's paper summarizer.
+"""
+from plugins import research_plugin
+from plugins.research_plugin import ResearchPlugin
+
+SAMPLE_PAPER = """Abstract
+We study a method [1] that builds on prior work [2], as in Smith et al. (2020).
+1. Introduction
+Motivation for the approach [1].
+2. Methods and Background
+Details of the setup.
+3. Results and Discussion
+The approach works.
+4. Conclusion
+"""
+
+def test_summarize_detects_sections_in_priority_order():
+    """Lines naming several sections are filed under the highest-priority one."""
+    result = ResearchPlugin.summarize_research_paper(SAMPLE_PAPER)
+
+    assert result["section_names"] == ["preamble", "abstract", "introduction", "background", "results", "conclusion"]
+    assert result["has_abstract"] and result["has_conclusion"]
+    assert result["references_count"] == 2
+    assert result["citations_sample"] == ["Smith et al. (2020)"]
+
+ARXIV_RESPONSE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/2103.00020v2</id>
+    <title>A Test Paper</title>
+    <summary>Short summary.</summary>
+    <published>2021-03-01T00:00:00Z</published>
+    <author><name>Ada Lovelace</name></author>
+    <category term="cs.LG"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2103.00020"/>
+  </entry>
+</feed>"""
+
+class MockResponse:
+    """Minimal stand-in for a requests.Response."""
+    content = ARXIV_RESPONSE
+
+    def raise_for_status(self):
+        pass
+
+def test_get_arxiv_paper_caches_lookups(monkeypatch):
+    """Repeat lookups of a paper are served without another API request."""
+    calls = []
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        return MockResponse()
+
+    monkeypatch.setattr(research_plugin._SESSION, "get", fake_get)
+    research_plugin._ARXIV_CACHE.clear()
+
+    first = ResearchPlugin.get_arxiv_paper("https://arxiv.org/abs/2103.00020v2")
+    first["authors"].append("Mutated")
+    second = ResearchPlugin.get_arxiv_paper("2103.00020")
+
+    assert len(calls) == 1
+    assert second["title"] == "A Test Paper"
+    assert second["authors"] == ["Ada Lovelace"]
+
+def test_get_arxiv_papers_batches_uncached_ids(monkeypatch):
+    """Several papers are looked up with one request, skipping cached ones."""
+    requested = []
+
+    def fake_get(url, params=None, **kwargs):
+        requested.append(params["id_list"])
+        return MockResponse()
+
+    monkeypatch.setattr(research_plugin._SESSION, "get", fake_get)
+    research_plugin._ARXIV_CACHE.clear()
+
+    result = ResearchPlugin.get_arxiv_papers(["2103.00020", "https://arxiv.org/abs/9999.99999v1"])
+    again = ResearchPlugin.get_arxiv_papers(["2103.00020"])
+
+    assert requested == ["2103.00020,9999.99999"]
+    assert [paper["id"] for paper in result["papers"]] == ["2103.00020"]
+    assert result["not_found"] == ["9999.99999"]
+    assert again["papers"][0]["title"] == "A Test Paper"
+
+def test_session_retries_ignore_retry_after():
+    """arXiv rate limiting is retried on the backoff schedule, not its Retry-After."""
+    retry = research_plugin._SESSION.get_adapter("http://export.arxiv.org/").max_retries
+    assert retry.respect_retry_after_header is False
@@ -0,0 +1,68 @@
+"""
+Tests for the search plugin's tool lookup.
+"""
+import duckduckgo_search
+
+from plugins import research_plugin  # noqa: F401  (registers the research tools)
+from plugins import search_plugin
+from plugins.search_plugin import SearchPlugin
+
+class FakeDDGS:
+    """Stand-in for duckduckgo_search.DDGS that counts queries."""
+    queries = []
+    instances = 0
+
+    def __init__(self):
+        FakeDDGS.instances += 1
+
+    def text(self, query, **kwargs):
+        FakeDDGS.queries.append(query)
+        return [{"title": "Result", "href": "https://example.com/", "body": "Snippet"}]
+
+def test_find_tools_filters_by_keyword_and_category():
+    """Keyword and category filters are case-insensitive and can be combined."""
+    names = [entry["name"] for entry in SearchPlugin.find_tools(keyword="ARXIV")]
+    assert "get_arxiv_paper" in names
+    assert "summarize_research_paper" not in names
+
+    analysis = SearchPlugin.find_tools(keyword="paper", category="Analysis")
+    assert [entry["name"] for entry in analysis] == ["summarize_research_paper"]
+    assert analysis[0]["signature"].startswith("summarize_research_paper(text: str")
+
+def test_find_tools_results_do_not_share_cached_entries():
+    """Modifying a result leaves later lookups untouched."""
+    first = SearchPlugin.find_tools(keyword="get_arxiv_paper")[0]
+    first["categories"].append("modified")
+    first["description"] = ""
+
+    second = SearchPlugin.find_tools(keyword="get_arxiv_paper")[0]
+    assert "modified" not in second["categories"]
+    assert second["description"]
+
+def test_web_search_caches_repeated_queries(monkeypatch):
+    """Identical searches within the TTL reuse the earlier results."""
+    monkeypatch.setattr(duckduckgo_search, "DDGS", FakeDDGS)
+    monkeypatch.setattr(search_plugin, "_DDGS", None)
+    FakeDDGS.queries = []
+    search_plugin._SEARCH_CACHE.clear()
+
+    first = SearchPlugin.web_search("python packaging")
+    first[0]["title"] = "Modified"
+    second = SearchPlugin.web_search("python packaging")
+
+    assert FakeDDGS.queries == ["python packaging"]
+    assert second == [{"title": "Result", "url": "https://example.com/", "snippet": "Snippet"}]
+
+def test_web_search_reuses_one_client(monkeypatch):
+    """Different searches share a single DuckDuckGo client."""
+    monkeypatch.setattr(duckduckgo_search, "DDGS", FakeDDGS)
+    monkeypatch.setattr(search_plugin, "_DDGS", None)
+    FakeDDGS.queries = []
+    FakeDDGS.instances = 0
+    search_plugin._SEARCH_CACHE.clear()
+
+    SearchPlugin.web_search("first query")
+    SearchPlugin.web_search("second query")
+
+    assert FakeDDGS.queries == ["first query", "second query"]
+    assert FakeDDGS.instances == 1
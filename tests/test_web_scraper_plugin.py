@@ -0,0 +1,125 @@
+"""
+Tests for the web scraper plugin extraction helpers.
+"""
+import importlib.util
+
+import pytest
+
+from plugins import web_scraper_plugin
+
+SAMPLE_PAGE = (
+    "<html><head><title>My Page</title>"
+    "<meta property='og:title' content='OG Title'>"
+    "<meta name='description' content='Page description'></head>"
+    "<body><nav>Home About Contact</nav>"
+    "<article><h1>The Great Headline Of The Article</h1>"
+    "<p>" + "This is a long sentence of article content. " * 10 + "</p>"
+    "<p>Another paragraph that has enough text in it.</p>"
+    "<p>Too short</p></article>"
+    "<div class='sidebar'><p>Sidebar advertisement text here</p></div>"
+    "</body></html>"
+)
+
+def test_soup_extraction_finds_article_paragraphs():
+    """The heuristic extractor keeps the article blocks and page metadata."""
+    title, metadata, paragraphs = web_scraper_plugin._extract_with_soup(SAMPLE_PAGE)
+
+    assert title == "My Page"
+    assert metadata == {"og:title": "OG Title", "description": "Page description"}
+    assert paragraphs[0] == "The Great Headline Of The Article"
+    assert "Too short" not in paragraphs
+    assert all("Sidebar" not in p for p in paragraphs)
+
+def test_readability_extraction_matches_soup():
+    """Both extraction strategies agree on a simple article page."""
+    pytest.importorskip("readability")
+
+    extracted = web_scraper_plugin._extract_with_readability(SAMPLE_PAGE, "https://example.com/")
+
+    assert extracted == web_scraper_plugin._extract_with_soup(SAMPLE_PAGE)
+
+def test_soup_extraction_prefers_main_over_content_div():
+    """A <main> element wins over an earlier div with a content class."""
+    page = (
+        "<html><body><div class='post'><p>Teaser paragraph from the sidebar div</p></div>"
+        "<main><p>Body paragraph inside the main element</p></main></body></html>"
+    )
+    _, _, paragraphs = web_scraper_plugin._extract_with_soup(page)
+
+    assert paragraphs == ["Body paragraph inside the main element"]
+
+def test_session_retries_ignore_retry_after():
+    """Retries use the backoff schedule rather than sleeping for a server's Retry-After."""
+    pytest.importorskip("requests")
+    retry = web_scraper_plugin._get_session().get_adapter("https://example.com/").max_retries
+    assert retry.respect_retry_after_header is False
+
+class StreamedPage:
+    """Minimal streamed response serving a fixed page."""
+    def __init__(self, content, content_type, status_code=200):
+        self.content = content
+        self.headers = {"Content-Type": content_type}
+        self.status_code = status_code
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        yield self.content
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+@pytest.mark.parametrize("charset", ["utf8mb4", "x-bogus"])
+def test_smart_extraction_ignores_unknown_charsets(monkeypatch, charset):
+    """An unknown declared charset is ignored rather than failing the extraction."""
+    page = SAMPLE_PAGE.replace("<head>", "<head><meta charset='utf-8'>").encode("utf-8")
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            return StreamedPage(page, f"text/html; charset={charset}")
+
+    monkeypatch.setattr(web_scraper_plugin, "_get_session", FakeSession)
+    web_scraper_plugin._SMART_EXTRACTION_CACHE.clear()
+
+    result = web_scraper_plugin.WebScraperPlugin.smart_content_extraction(f"https://example.com/{charset}")
+
+    assert "error" not in result
+    assert result["title"] == "My Page"
+    assert result["content"].startswith("The Great Headline Of The Article")
+
+@pytest.mark.parametrize("call", [
+    lambda plugin: plugin.extract_structured_data("https://example.com/", {"title": "h1"}),
+    pytest.param(
+        lambda plugin: plugin.extract_tables_to_dataframes("https://example.com/"),
+        marks=pytest.mark.skipif(importlib.util.find_spec("pandas") is None, reason="pandas not installed")
+    ),
+    lambda plugin: plugin.scrape_with_pagination("https://example.com/", max_pages=1),
+    lambda plugin: plugin.smart_content_extraction("https://example.com/missing"),
+])
+def test_scrapers_close_response_on_http_error(monkeypatch, call):
+    """Streamed responses are released even when the page returns an HTTP error."""
+    pytest.importorskip("bs4")
+    responses = []
+
+    class FakeSession:
+        def get(self, url, **kwargs):
+            responses.append(StreamedPage(b"", "text/html", status_code=404))
+            return responses[-1]
+
+    monkeypatch.setattr(web_scraper_plugin, "_get_session", FakeSession)
+    web_scraper_plugin._SMART_EXTRACTION_CACHE.clear()
+
+    result = call(web_scraper_plugin.WebScraperPlugin)
+
+    assert "HTTP 404" in str(result)
+    assert responses and all(response.closed for response in responses)